@@ -10,7 +10,9 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
+from pathlib import Path
 import numpy as np
+import pyarrow as pa
 
 # Page configuration
 st.set_page_config(
@@ -49,11 +51,15 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-@st.cache_data
-def load_data():
-    """Load and preprocess surveillance data."""
-    # Generate synthetic data inline for demo
-    np.random.seed(42)
+DATA_PATH = Path(__file__).parent / "data" / "wildlife_health_data.parquet"
+
+# Below this many filtered cases the charts are skipped
+MIN_CHART_CASES = 5
+
+
+def generate_data():
+    """Generate synthetic surveillance data inline for demo."""
+    rng = np.random.default_rng(42)
 
     regions = {
         "Maasai Mara": (-1.4833, 35.1333),
@@ -83,48 +89,128 @@ def load_data():
     end_date = datetime.now()
     start_date = end_date - timedelta(days=365)
 
-    data = []
-    for i in range(n_records):
-        region = np.random.choice(list(regions.keys()))
-        lat, lon = regions[region]
-        lat += np.random.normal(0, 0.1)
-        lon += np.random.normal(0, 0.1)
-
-        days_offset = np.random.randint(0, 365)
-        report_date = start_date + timedelta(days=days_offset)
-
-        species = np.random.choice(species_list, p=[0.15, 0.08, 0.20, 0.12, 0.18, 0.12, 0.05, 0.02, 0.03, 0.05])
-        syndrome = np.random.choice(syndromes)
-        severity = np.random.choice(severity_levels, p=[0.40, 0.35, 0.20, 0.05])
-
-        days_ago = (end_date - report_date).days
-        if days_ago < 14:
-            status = np.random.choice(status_options, p=[0.60, 0.20, 0.20])
-        elif days_ago < 60:
-            status = np.random.choice(status_options, p=[0.30, 0.50, 0.20])
-        else:
-            status = np.random.choice(status_options, p=[0.10, 0.80, 0.10])
-
-        n_affected = np.random.randint(1, 10)
-
-        data.append({
-            "case_id": f"WHW-2024-{i+1:04d}",
-            "report_date": report_date,
-            "region": region,
-            "latitude": round(lat, 4),
-            "longitude": round(lon, 4),
-            "species": species,
-            "syndrome": syndrome,
-            "severity": severity,
-            "status": status,
-            "animals_affected": n_affected,
-        })
-
-    df = pd.DataFrame(data)
+    region_names = np.array(list(regions.keys()))
+    region_idx = rng.integers(0, len(region_names), size=n_records)
+    coords = np.array(list(regions.values()))[region_idx]
+    coords += rng.normal(0, 0.1, size=(n_records, 2))
+
+    days_offset = rng.integers(0, 365, size=n_records)
+    report_date = start_date + pd.to_timedelta(days_offset, unit="D")
+
+    species = rng.choice(species_list, size=n_records, p=[0.15, 0.08, 0.20, 0.12, 0.18, 0.12, 0.05, 0.02, 0.03, 0.05])
+    syndrome = rng.choice(syndromes, size=n_records)
+    severity = rng.choice(severity_levels, size=n_records, p=[0.40, 0.35, 0.20, 0.05])
+
+    # Status odds by report age: < 14 days, < 60 days, older
+    status_p = np.array([
+        [0.60, 0.20, 0.20],
+        [0.30, 0.50, 0.20],
+        [0.10, 0.80, 0.10],
+    ])
+    days_ago = 365 - days_offset
+    cum_p = status_p.cumsum(axis=1)[np.digitize(days_ago, [14, 60])]
+    status_idx = (rng.random(n_records)[:, None] > cum_p[:, :-1]).sum(axis=1)
+
+    df = pd.DataFrame({
+        "case_id": [f"WHW-2024-{i+1:04d}" for i in range(n_records)],
+        "report_date": report_date,
+        "region": region_names[region_idx],
+        "latitude": coords[:, 0].round(4),
+        "longitude": coords[:, 1].round(4),
+        "species": species,
+        "syndrome": syndrome,
+        "severity": severity,
+        "status": np.array(status_options)[status_idx],
+        "animals_affected": rng.integers(1, 10, size=n_records),
+    })
+    return df
+
+
+@st.cache_resource
+def load_data():
+    """Load and preprocess surveillance data.
+
+    The frame is shared read-only by every session; filtering always
+    returns a new frame, so callers must not modify it in place.
+    """
+    # Prefer the dataset written by data/generate_data.py
+    if DATA_PATH.exists():
+        df = pd.read_parquet(DATA_PATH)
+    else:
+        df = generate_data()
     df = df.sort_values("report_date").reset_index(drop=True)
+
+    # Days since the epoch, so date filters compare plain integers
+    df["report_day"] = df["report_date"].values.astype("datetime64[D]").astype("int64")
+    # Monday-based week number (the epoch fell on a Thursday)
+    df["week_idx"] = ((df["report_day"] + 3) // 7).astype("int32")
+    # Reported within the last 30 days, for the "this month" metric
+    today = np.datetime64("today", "D").astype("int64")
+    df["is_recent_30d"] = df["report_day"] > today - 30
+
+    # Compact dtypes: low-cardinality labels as categories, narrow numerics
+    for col in ["region", "species", "syndrome", "severity", "status"]:
+        df[col] = df[col].astype("category")
+    df["animals_affected"] = df["animals_affected"].astype("int16")
+    df[["latitude", "longitude"]] = df[["latitude", "longitude"]].astype("float32")
     return df
 
 
+def _frame_key(df):
+    """Cheap cache key for frames sliced out of the loaded data.
+
+    Filtering keeps the source row labels, so the index alone identifies
+    which records a frame holds.
+    """
+    return df.index.to_numpy().tobytes()
+
+
+def _category_mask(values, selected):
+    """Mask rows of a categorical column whose label is in ``selected``."""
+    codes = values.cat.categories.get_indexer(list(selected))
+    return np.isin(values.cat.codes.to_numpy(), codes[codes >= 0])
+
+
+@st.cache_data(hash_funcs={pd.DataFrame: _frame_key})
+def sidebar_options(df):
+    """Collect the sidebar filter choices from the loaded data."""
+    # Categories already hold each column's distinct labels
+    return {
+        "min_date": df["report_date"].iloc[0].date(),
+        "max_date": df["report_date"].iloc[-1].date(),
+        "regions": sorted(df["region"].cat.categories.tolist()),
+        "species": sorted(df["species"].cat.categories.tolist()),
+        "statuses": df["status"].cat.categories.tolist(),
+    }
+
+
+@st.cache_data(hash_funcs={pd.DataFrame: _frame_key})
+def apply_filters(df, date_range, region, species, severity, status):
+    """Filter surveillance records by the sidebar selections."""
+    # Combine every predicate into one mask and index once
+    mask = np.ones(len(df), dtype=bool)
+
+    if len(date_range) == 2:
+        lo, hi = np.array(date_range, dtype="datetime64[D]").astype("int64")
+        report_day = df["report_day"].to_numpy()
+        mask &= (report_day >= lo) & (report_day <= hi)
+
+    if region != "All":
+        mask &= _category_mask(df["region"], [region])
+
+    if species != "All":
+        mask &= _category_mask(df["species"], [species])
+
+    if severity:
+        mask &= _category_mask(df["severity"], severity)
+
+    if status:
+        mask &= _category_mask(df["status"], status)
+
+    return df[mask]
+
+
+@st.cache_data(hash_funcs={pd.DataFrame: _frame_key})
 def create_map(df):
     """Create an interactive map of surveillance events."""
     color_map = {
@@ -134,44 +220,74 @@ def create_map(df):
         "Critical": "#E63946"
     }
 
-    fig = px.scatter_mapbox(
-        df,
-        lat="latitude",
-        lon="longitude",
-        color="severity",
-        size="animals_affected",
-        hover_name="case_id",
-        hover_data=["species", "syndrome", "region", "report_date"],
-        color_discrete_map=color_map,
-        zoom=5.5,
-        center={"lat": -1.0, "lon": 37.5},
-        mapbox_style="carto-positron",
-        title=""
-    )
+    # Hover fields for every record, sliced per severity trace below
+    customdata = np.column_stack([
+        df["species"].to_numpy(),
+        df["syndrome"].to_numpy(),
+        df["region"].to_numpy(),
+        np.datetime_as_string(df["report_date"].to_numpy(), unit="D"),
+        df["animals_affected"].to_numpy(),
+    ])
+    # Marker area scales with animals affected, up to 20px across
+    size = df["animals_affected"].to_numpy()
+    sizeref = 2.0 * size.max() / (20 ** 2)
+
+    fig = go.Figure()
+
+    for severity, color in color_map.items():
+        rows = _category_mask(df["severity"], [severity])
+        if not rows.any():
+            continue
+        fig.add_trace(go.Scattermapbox(
+            lat=df["latitude"].to_numpy()[rows],
+            lon=df["longitude"].to_numpy()[rows],
+            mode="markers",
+            marker=dict(size=size[rows], sizemode="area", sizeref=sizeref, color=color),
+            text=df["case_id"].to_numpy()[rows],
+            customdata=customdata[rows],
+            hovertemplate=(
+                "<b>%{text}</b><br>"
+                "Species: %{customdata[0]}<br>"
+                "Syndrome: %{customdata[1]}<br>"
+                "Region: %{customdata[2]}<br>"
+                "Date: %{customdata[3]}<br>"
+                "Animals affected: %{customdata[4]}"
+            ),
+            name=severity
+        ))
 
     fig.update_layout(
+        mapbox=dict(
+            style="carto-positron",
+            zoom=5.5,
+            center={"lat": -1.0, "lon": 37.5}
+        ),
         margin={"r": 0, "t": 0, "l": 0, "b": 0},
         height=450,
         legend=dict(
+            title_text="severity",
             orientation="h",
             yanchor="bottom",
             y=1.02,
             xanchor="right",
             x=1
-        )
+        ),
+        uirevision="dashboard"
     )
 
     return fig
 
 
+@st.cache_data(hash_funcs={pd.DataFrame: _frame_key})
 def create_timeline(df):
     """Create a timeline of cases."""
-    daily = df.groupby(df["report_date"].dt.to_period("W")).agg({
-        "case_id": "count",
-        "animals_affected": "sum"
-    }).reset_index()
-    daily["report_date"] = daily["report_date"].astype(str)
-    daily.columns = ["Week", "Cases", "Animals Affected"]
+    daily = df.groupby("week_idx", sort=True).agg(
+        Cases=("case_id", "size"),
+        Animals=("animals_affected", "sum")
+    ).reset_index()
+    # Week numbers start on Monday; label them as ISO weeks
+    week_start = pd.to_datetime(daily["week_idx"] * 7 - 3, unit="D")
+    daily["Week"] = week_start.dt.strftime("%G-W%V")
 
     fig = go.Figure()
 
@@ -188,59 +304,100 @@ def create_timeline(df):
         yaxis_title="Number of Cases",
         height=350,
         margin=dict(l=40, r=40, t=60, b=40),
-        showlegend=False
+        showlegend=False,
+        uirevision="dashboard"
     )
 
     return fig
 
 
+@st.cache_data(hash_funcs={pd.DataFrame: _frame_key})
 def create_species_chart(df):
     """Create species distribution chart."""
-    species_counts = df["species"].value_counts().reset_index()
-    species_counts.columns = ["Species", "Count"]
+    species_counts = df["species"].value_counts()
+    species_counts = species_counts[species_counts > 0]
 
-    fig = px.bar(
-        species_counts,
-        x="Count",
-        y="Species",
+    fig = go.Figure(go.Bar(
+        x=species_counts.to_numpy(),
+        y=species_counts.index.to_numpy(),
         orientation="h",
-        color="Count",
-        color_continuous_scale=["#95D5B2", "#2D6A4F"]
-    )
+        marker_color="#2D6A4F"
+    ))
 
     fig.update_layout(
         title="Cases by Species",
+        xaxis_title="Count",
+        yaxis_title="Species",
         height=350,
         margin=dict(l=40, r=40, t=40, b=40),
         showlegend=False,
-        coloraxis_showscale=False
+        uirevision="dashboard"
     )
 
     return fig
 
 
+@st.cache_data(hash_funcs={pd.DataFrame: _frame_key})
 def create_syndrome_chart(df):
     """Create syndrome distribution chart."""
-    syndrome_counts = df["syndrome"].value_counts().reset_index()
-    syndrome_counts.columns = ["Syndrome", "Count"]
-
-    fig = px.pie(
-        syndrome_counts,
-        values="Count",
-        names="Syndrome",
-        color_discrete_sequence=px.colors.sequential.Greens_r,
+    syndrome_counts = df["syndrome"].value_counts()
+    syndrome_counts = syndrome_counts[syndrome_counts > 0]
+
+    fig = go.Figure(go.Pie(
+        labels=syndrome_counts.index.to_numpy(),
+        values=syndrome_counts.to_numpy(),
+        marker=dict(colors=px.colors.sequential.Greens_r),
         hole=0.4
-    )
+    ))
 
     fig.update_layout(
         title="Syndrome Distribution",
         height=350,
         margin=dict(l=40, r=40, t=40, b=40),
+        uirevision="dashboard"
     )
 
     return fig
 
 
+@st.cache_data(hash_funcs={pd.DataFrame: _frame_key})
+def recent_cases_table(df):
+    """Create the recent cases table as an Arrow table."""
+    recent_df = df.nlargest(10, "report_date")
+
+    display_df = recent_df[["case_id", "report_date", "region", "species", "syndrome", "severity", "status", "animals_affected"]]
+    display_df.columns = ["Case ID", "Date", "Region", "Species", "Syndrome", "Severity", "Status", "Animals"]
+
+    return pa.Table.from_pandas(display_df, preserve_index=False)
+
+
+def render_charts(df):
+    """Render the map, timeline, species and syndrome charts."""
+    # Map and timeline
+    col_left, col_right = st.columns([2, 1])
+
+    with col_left:
+        st.subheader("📍 Geographic Distribution")
+        st.plotly_chart(create_map(df), use_container_width=True)
+
+    with col_right:
+        st.subheader("📈 Case Trends")
+        st.plotly_chart(create_timeline(df), use_container_width=True)
+
+    st.markdown("---")
+
+    # Species and syndrome charts
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("🦒 Species Analysis")
+        st.plotly_chart(create_species_chart(df), use_container_width=True)
+
+    with col2:
+        st.subheader("🔬 Syndrome Distribution")
+        st.plotly_chart(create_syndrome_chart(df), use_container_width=True)
+
+
 def main():
     # Load data
     df = load_data()
@@ -253,9 +410,11 @@ def main():
     # Sidebar filters
     st.sidebar.header("🔍 Filters")
 
+    options = sidebar_options(df)
+
     # Date range filter
-    min_date = df["report_date"].min().date()
-    max_date = df["report_date"].max().date()
+    min_date = options["min_date"]
+    max_date = options["max_date"]
 
     date_range = st.sidebar.date_input(
         "Date Range",
@@ -265,11 +424,11 @@ def main():
     )
 
     # Region filter
-    regions = ["All"] + sorted(df["region"].unique().tolist())
+    regions = ["All"] + options["regions"]
     selected_region = st.sidebar.selectbox("Region", regions)
 
     # Species filter
-    species = ["All"] + sorted(df["species"].unique().tolist())
+    species = ["All"] + options["species"]
     selected_species = st.sidebar.selectbox("Species", species)
 
     # Severity filter
@@ -281,7 +440,7 @@ def main():
     )
 
     # Status filter
-    status_options = df["status"].unique().tolist()
+    status_options = options["statuses"]
     selected_status = st.sidebar.multiselect(
         "Status",
         status_options,
@@ -289,34 +448,24 @@ def main():
     )
 
     # Apply filters
-    filtered_df = df.copy()
-
-    if len(date_range) == 2:
-        filtered_df = filtered_df[
-            (filtered_df["report_date"].dt.date >= date_range[0]) &
-            (filtered_df["report_date"].dt.date <= date_range[1])
-        ]
-
-    if selected_region != "All":
-        filtered_df = filtered_df[filtered_df["region"] == selected_region]
-
-    if selected_species != "All":
-        filtered_df = filtered_df[filtered_df["species"] == selected_species]
-
-    if selected_severity:
-        filtered_df = filtered_df[filtered_df["severity"].isin(selected_severity)]
-
-    if selected_status:
-        filtered_df = filtered_df[filtered_df["status"].isin(selected_status)]
+    filtered_df = apply_filters(
+        df,
+        tuple(date_range),
+        selected_region,
+        selected_species,
+        tuple(selected_severity),
+        tuple(selected_status),
+    )
 
     # Key metrics
     col1, col2, col3, col4, col5 = st.columns(5)
 
     with col1:
+        recent_cases = int(filtered_df["is_recent_30d"].sum())
         st.metric(
             label="Total Cases",
             value=len(filtered_df),
-            delta=f"{len(filtered_df[filtered_df['report_date'] > datetime.now() - timedelta(days=30)])} this month"
+            delta=f"{recent_cases} this month"
         )
 
     with col2:
@@ -353,53 +502,26 @@ def main():
 
     st.markdown("---")
 
-    # Map and timeline
-    col_left, col_right = st.columns([2, 1])
-
-    with col_left:
-        st.subheader("📍 Geographic Distribution")
-        if len(filtered_df) > 0:
-            st.plotly_chart(create_map(filtered_df), use_container_width=True)
-        else:
-            st.warning("No data available for selected filters.")
-
-    with col_right:
-        st.subheader("📈 Case Trends")
-        if len(filtered_df) > 0:
-            st.plotly_chart(create_timeline(filtered_df), use_container_width=True)
-        else:
-            st.warning("No data available for selected filters.")
-
-    st.markdown("---")
-
-    # Species and syndrome charts
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.subheader("🦒 Species Analysis")
-        if len(filtered_df) > 0:
-            st.plotly_chart(create_species_chart(filtered_df), use_container_width=True)
-
-    with col2:
-        st.subheader("🔬 Syndrome Distribution")
-        if len(filtered_df) > 0:
-            st.plotly_chart(create_syndrome_chart(filtered_df), use_container_width=True)
+    # Charts need a handful of cases to say anything
+    if len(filtered_df) == 0:
+        st.warning("No data available for selected filters.")
+    elif len(filtered_df) < MIN_CHART_CASES:
+        st.info(f"Only {len(filtered_df)} cases match; showing table only.")
+    else:
+        render_charts(filtered_df)
 
     st.markdown("---")
 
     # Recent cases table
     st.subheader("📋 Recent Cases")
 
-    recent_df = filtered_df.sort_values("report_date", ascending=False).head(10)
-
-    display_df = recent_df[["case_id", "report_date", "region", "species", "syndrome", "severity", "status", "animals_affected"]].copy()
-    display_df["report_date"] = display_df["report_date"].dt.strftime("%Y-%m-%d")
-    display_df.columns = ["Case ID", "Date", "Region", "Species", "Syndrome", "Severity", "Status", "Animals"]
-
     st.dataframe(
-        display_df,
+        recent_cases_table(filtered_df),
         use_container_width=True,
-        hide_index=True
+        hide_index=True,
+        column_config={
+            "Date": st.column_config.DateColumn("Date", format="YYYY-MM-DD")
+        }
     )
 
     # Footer
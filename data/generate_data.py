@@ -4,11 +4,10 @@ Generate synthetic wildlife health surveillance data for Kenya.
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import random
+from pathlib import Path
 
-# Set seed for reproducibility
-np.random.seed(42)
-random.seed(42)
+# Output file, read by the dashboard on startup
+OUTPUT_PATH = Path(__file__).with_name("wildlife_health_data.parquet")
 
 # Kenya wildlife regions and coordinates
 REGIONS = {
@@ -54,89 +53,102 @@ SEVERITY = ["Low", "Moderate", "High", "Critical"]
 # Status
 STATUS = ["Active", "Resolved", "Under Investigation"]
 
+# Species weights (some more common)
+SPECIES_WEIGHTS = np.array([15, 8, 20, 12, 18, 15, 5, 2, 3, 7])
 
-def generate_surveillance_data(n_records=500):
+# Syndrome weights by season: dry (more respiratory), wet (more GI), other
+SYNDROME_WEIGHTS = np.array([
+    [25, 15, 10, 15, 10, 10, 5, 10],
+    [15, 25, 10, 10, 10, 15, 10, 5],
+    [15, 15, 15, 15, 10, 15, 10, 5],
+])
+
+# Severity weights
+SEVERITY_WEIGHTS = np.array([40, 35, 20, 5])
+
+# Status weights by report age: < 14 days, < 60 days, older
+STATUS_AGE_BINS = [14, 60]
+STATUS_WEIGHTS = np.array([
+    [60, 20, 20],
+    [30, 50, 20],
+    [10, 80, 10],
+])
+
+# Animals affected range (inclusive) per severity level
+AFFECTED_RANGE = np.array([
+    [1, 3],
+    [1, 5],
+    [3, 10],
+    [5, 20],
+])
+
+
+def _cdf(weights):
+    """Cumulative probabilities for each row of a weight table."""
+    return weights.cumsum(axis=1) / weights.sum(axis=1, keepdims=True)
+
+
+SYNDROME_CDF = _cdf(SYNDROME_WEIGHTS)
+STATUS_CDF = _cdf(STATUS_WEIGHTS)
+
+
+def _sample_rows(cdf, rows, u):
+    """Draw one category index per record from the CDF row it falls in."""
+    return (u[:, None] > cdf[rows, :-1]).sum(axis=1)
+
+
+def generate_surveillance_data(n_records=500, seed=42):
     """Generate synthetic surveillance records."""
 
+    # Seeded generator for reproducibility
+    rng = np.random.default_rng(seed)
+
     # Date range: last 12 months
     end_date = datetime.now()
     start_date = end_date - timedelta(days=365)
 
-    data = []
-
-    for i in range(n_records):
-        region = random.choice(list(REGIONS.keys()))
-        lat, lon = REGIONS[region]
-
-        # Add some randomness to coordinates
-        lat += np.random.normal(0, 0.1)
-        lon += np.random.normal(0, 0.1)
-
-        # Random date within range
-        days_offset = random.randint(0, 365)
-        report_date = start_date + timedelta(days=days_offset)
-
-        # Species with weighted probability (some more common)
-        species = random.choices(
-            SPECIES,
-            weights=[15, 8, 20, 12, 18, 15, 5, 2, 3, 7],
-            k=1
-        )[0]
-
-        # Syndrome with seasonal variation
-        month = report_date.month
-        if month in [6, 7, 8]:  # Dry season - more respiratory
-            syndrome_weights = [25, 15, 10, 15, 10, 10, 5, 10]
-        elif month in [3, 4, 5, 11]:  # Wet season - more GI
-            syndrome_weights = [15, 25, 10, 10, 10, 15, 10, 5]
-        else:
-            syndrome_weights = [15, 15, 15, 15, 10, 15, 10, 5]
-
-        syndrome = random.choices(SYNDROMES, weights=syndrome_weights, k=1)[0]
-
-        # Severity
-        severity = random.choices(
-            SEVERITY,
-            weights=[40, 35, 20, 5],
-            k=1
-        )[0]
-
-        # Status based on date
-        days_ago = (end_date - report_date).days
-        if days_ago < 14:
-            status = random.choices(STATUS, weights=[60, 20, 20], k=1)[0]
-        elif days_ago < 60:
-            status = random.choices(STATUS, weights=[30, 50, 20], k=1)[0]
-        else:
-            status = random.choices(STATUS, weights=[10, 80, 10], k=1)[0]
-
-        # Number of animals affected
-        if severity == "Critical":
-            n_affected = random.randint(5, 20)
-        elif severity == "High":
-            n_affected = random.randint(3, 10)
-        elif severity == "Moderate":
-            n_affected = random.randint(1, 5)
-        else:
-            n_affected = random.randint(1, 3)
-
-        record = {
-            "case_id": f"WHW-{2024}-{i+1:04d}",
-            "report_date": report_date.strftime("%Y-%m-%d"),
-            "region": region,
-            "latitude": round(lat, 4),
-            "longitude": round(lon, 4),
-            "species": species,
-            "syndrome": syndrome,
-            "severity": severity,
-            "status": status,
-            "animals_affected": n_affected,
-        }
-
-        data.append(record)
-
-    df = pd.DataFrame(data)
-    df["report_date"] = pd.to_datetime(df["report_date"])
+    region_names = np.array(list(REGIONS.keys()))
+    region_idx = rng.integers(0, len(region_names), size=n_records)
+    coords = np.array(list(REGIONS.values()))[region_idx]
+
+    # Add some randomness to coordinates
+    coords += rng.normal(0, 0.1, size=(n_records, 2))
+
+    # Random date within range
+    days_offset = rng.integers(0, 366, size=n_records)
+    report_date = start_date + pd.to_timedelta(days_offset, unit="D")
+
+    # Species with weighted probability (some more common)
+    species = rng.choice(SPECIES, size=n_records, p=SPECIES_WEIGHTS / SPECIES_WEIGHTS.sum())
+
+    # Syndrome with seasonal variation
+    month = report_date.month
+    season = np.where(np.isin(month, [6, 7, 8]), 0, np.where(np.isin(month, [3, 4, 5, 11]), 1, 2))
+    syndrome_idx = _sample_rows(SYNDROME_CDF, season, rng.random(n_records))
+
+    # Severity
+    severity_idx = rng.choice(len(SEVERITY), size=n_records, p=SEVERITY_WEIGHTS / SEVERITY_WEIGHTS.sum())
+
+    # Status based on date
+    days_ago = 365 - days_offset
+    status_idx = _sample_rows(STATUS_CDF, np.digitize(days_ago, STATUS_AGE_BINS), rng.random(n_records))
+
+    # Number of animals affected
+    affected_range = AFFECTED_RANGE[severity_idx]
+    n_affected = rng.integers(affected_range[:, 0], affected_range[:, 1] + 1)
+
+    df = pd.DataFrame({
+        "case_id": [f"WHW-{2024}-{i+1:04d}" for i in range(n_records)],
+        "report_date": report_date.normalize(),
+        "region": region_names[region_idx],
+        "latitude": coords[:, 0].round(4),
+        "longitude": coords[:, 1].round(4),
+        "species": species,
+        "syndrome": np.array(SYNDROMES)[syndrome_idx],
+        "severity": np.array(SEVERITY)[severity_idx],
+        "status": np.array(STATUS)[status_idx],
+        "animals_affected": n_affected,
+    })
     df = df.sort_values("report_date").reset_index(drop=True)
 
     return df
@@ -144,6 +156,6 @@ def generate_surveillance_data(n_records=500):
 
 if __name__ == "__main__":
     df = generate_surveillance_data(500)
-    df.to_csv("wildlife_health_data.csv", index=False)
+    df.to_parquet(OUTPUT_PATH, engine="pyarrow", compression="zstd", index=False)
     print(f"Generated {len(df)} records")
     print(df.head())